@@ -21,18 +21,100 @@ Response: ?status=1/0&param1=value1&error=message
 Author: Generated for VSCP Protocol Testing
 """
 
+import argparse
+import logging
 import serial
 import time
 import random
 import threading
+import queue
 import re
-from urllib.parse import parse_qs, unquote
-from typing import Dict, Any, Optional
+from dataclasses import dataclass
+from functools import lru_cache
+from urllib.parse import unquote
+from typing import Dict, Any, List, Optional, Sequence, Tuple, Union
+
+log = logging.getLogger("vscp")
+
+# Handlers return either a message string or pre-encoded, newline-terminated bytes
+Response = Union[str, bytes]
+
+# Polls repeat the same request strings, so parsed messages are memoized
+@lru_cache(maxsize=256)
+def _parse_message_cached(message: str) -> Tuple[Tuple[str, str], ...]:
+    """Parse protocol message into an immutable tuple of key-value pairs"""
+    pairs = []
+    
+    # Remove leading '?' if present
+    clean_message = message.strip()
+    if clean_message[:1] == '?':
+        clean_message = clean_message[1:]
+    
+    # Split by '&' and parse key=value pairs (messages are machine-generated,
+    # so keys and values carry no surrounding whitespace)
+    if clean_message:
+        for pair in clean_message.split('&'):
+            key, sep, value = pair.partition('=')
+            if not sep:
+                continue
+            # Only pay for unquote() when the value is actually escaped
+            pairs.append((key, unquote(value) if '%' in value else value))
+    
+    return tuple(pairs)
+
+# Noise is drawn in batches of raw 32-bit samples; _NOISE_STEP maps a sample
+# onto [-1, 1)
+_NOISE_BATCH = 4096
+_NOISE_STEP = 2.0 / 2**32
+
+def _jitter(base: Tuple[float, ...], is_int: Tuple[bool, ...],
+            scale: Tuple[float, ...], noise: Sequence[int]) -> List[float]:
+    """Return base values with uniform noise of +-scale applied"""
+    return [
+        int(round(value + (sample * _NOISE_STEP - 1.0) * amount)) if int_field
+        else round(value + (sample * _NOISE_STEP - 1.0) * amount, 2)
+        for value, int_field, amount, sample in zip(base, is_int, scale, noise)
+    ]
+
+@dataclass(slots=True)
+class SensorState:
+    """Runtime state of a single sensor"""
+    type: Optional[str] = None  # None for ids that only carry pin/config
+    numeric_keys: Tuple[str, ...] = ()
+    base: Tuple[float, ...] = ()
+    is_int: Tuple[bool, ...] = ()
+    scale: Tuple[float, ...] = ()
+    update_prefix: str = ""  # static "?id=..&status=1&type=.." part of UPDATE
+    pin: Optional[int] = None
+    config: Optional[Dict[str, str]] = None
+
+class Framer:
+    """Split a raw serial byte stream into newline-terminated protocol frames"""
+    
+    def __init__(self):
+        self._buf = bytearray()
+        self._scan_from = 0  # bytes before this offset contain no newline
+    
+    def feed(self, data: bytes) -> List[bytes]:
+        """Append received bytes and return all complete frames"""
+        buf = self._buf
+        buf += data
+        frames = []
+        
+        # Only the bytes that arrived since the last scan are searched
+        end = buf.find(b'\n', self._scan_from)
+        while end != -1:
+            frames.append(bytes(buf[:end]))
+            del buf[:end + 1]
+            end = buf.find(b'\n')
+        
+        self._scan_from = len(buf)
+        return frames
 
 class VSCPEmulator:
     """Virtual Sensors Communication Protocol Emulator"""
     
-    def __init__(self, port='COM3', baudrate=115200, timeout=0.1):
+    def __init__(self, port='COM3', baudrate=115200, timeout=0.5):
         """Initialize the VSCP emulator"""
         self.API_VERSION = "1.2"
         self.DB_VERSION = "1.0.0"
@@ -41,8 +123,7 @@ class VSCPEmulator:
         
         # Protocol state
         self.initialized = False
-        self.connected_sensors = {}  # uid -> pin mapping
-        self.sensor_configs = {}     # uid -> config dict
+        self._pin_to_sensor = {}     # pin -> uid (reverse of SensorState.pin)
         
         # Serial connection
         self.port = port
@@ -50,6 +131,7 @@ class VSCPEmulator:
         self.timeout = timeout
         self.ser = None
         self.running = False
+        self._tx_queue = queue.Queue()  # encoded responses for write_loop
         
         # Dummy sensor data
         self.sensor_data = {
@@ -66,6 +148,55 @@ class VSCPEmulator:
             }
         }
         
+        # Per-sensor runtime state; numeric fields are pre-split so UPDATE does
+        # not have to copy and type-check every field
+        self.sensors: Dict[str, SensorState] = {}
+        for uid, fields in self.sensor_data.items():
+            numeric = [(k, v) for k, v in fields.items() if isinstance(v, (int, float))]
+            self.sensors[uid] = SensorState(
+                type=fields['type'],
+                update_prefix=f"?id={uid}&status=1&type={fields['type']}",
+                numeric_keys=tuple(k for k, _ in numeric),
+                base=tuple(v for _, v in numeric),
+                is_int=tuple(isinstance(v, int) for _, v in numeric),
+                # ints vary by -2..+2 after rounding, floats by +-0.5
+                scale=tuple(2.5 if isinstance(v, int) else 0.5 for _, v in numeric)
+            )
+        
+        # Batched noise samples for UPDATE jitter (filled on first use)
+        self._noise = memoryview(b'').cast('I')
+        self._noise_i = 0
+        
+        # Pre-encoded constant responses (written to the port as-is)
+        self._ERR_NOT_INIT = b"?status=0&error=Protocol not initialized\n"
+        self._err_unknown_type = {}  # request type -> encoded error
+        
+        # Fixed-shape success responses, formatted without build_message()
+        self._tmpl_init_ok = "?status=1&message=Initialized with {}".format
+        self._tmpl_config_ok = "?id={}&status=1&message=Configuration applied: {}".format
+        self._tmpl_reset_ok = "?id={}&status=1".format
+        self._tmpl_connect_ok = "?id={}&status=1&pin={}".format
+        self._tmpl_disconnect_ok = "?id={}&status=1&pin={}".format
+        
+        # Request type -> method id -> handler routing table
+        self._method_ids = {
+            name: i for i, name in enumerate(
+                ('INIT', 'UPDATE', 'CONFIG', 'RESET', 'CONNECT', 'DISCONNECT')
+            )
+        }
+        self._fns_ready = (
+            self.handle_init,
+            self.handle_update,
+            self.handle_config,
+            self.handle_reset,
+            self.handle_connect,
+            self.handle_disconnect
+        )
+        # Until INIT succeeds every method except INIT is rejected; handle_init
+        # swaps in the real handlers, so they need no initialized check
+        self._fns_not_init = (self.handle_init,) + (self._not_init,) * 5
+        self._method_fns = self._fns_not_init
+        
     def connect_serial(self) -> bool:
         """Connect to serial port"""
         try:
@@ -76,51 +207,53 @@ class VSCPEmulator:
             )
             if not self.ser.is_open:
                 self.ser.open()
-            print(f"✓ Connected to {self.port} at {self.baudrate} baud")
+            log.info("✓ Connected to %s at %s baud", self.port, self.baudrate)
             return True
         except Exception as e:
-            print(f"✗ Failed to connect to {self.port}: {e}")
+            log.error("✗ Failed to connect to %s: %s", self.port, e)
             return False
     
     def disconnect_serial(self):
         """Disconnect from serial port"""
         if self.ser and self.ser.is_open:
             self.ser.close()
-            print("✓ Serial connection closed")
+            log.info("✓ Serial connection closed")
+        _parse_message_cached.cache_clear()
+    
+    def _sensor_state(self, uid: str) -> SensorState:
+        """Return state for uid, creating a bare entry for unknown ids"""
+        state = self.sensors.get(uid)
+        if state is None:
+            state = self.sensors[uid] = SensorState()
+        return state
+    
+    def _next_noise(self, n: int) -> Sequence[int]:
+        """Return n raw noise samples, refilling the batch when exhausted"""
+        i = self._noise_i
+        if i + n > len(self._noise):
+            self._noise = memoryview(random.randbytes(4 * _NOISE_BATCH)).cast('I')
+            i = 0
+        self._noise_i = i + n
+        return self._noise[i:i + n]
     
     def parse_message(self, message: str) -> Dict[str, str]:
         """Parse protocol message into key-value pairs"""
-        params = {}
-        
-        # Remove leading '?' if present
-        clean_message = message.strip()
-        if clean_message.startswith('?'):
-            clean_message = clean_message[1:]
-        
-        # Split by '&' and parse key=value pairs
-        if clean_message:
-            pairs = clean_message.split('&')
-            for pair in pairs:
-                if '=' in pair:
-                    key, value = pair.split('=', 1)
-                    params[key.strip()] = unquote(value.strip())
-        
-        return params
+        return dict(_parse_message_cached(message))
     
     def build_message(self, params: Dict[str, Any]) -> str:
         """Build protocol message from key-value pairs"""
         if not params:
             return "?status=0&error=No parameters"
         
-        parts = []
-        for key, value in params.items():
-            parts.append(f"{key}={value}")
-        
-        return "?" + "&".join(parts)
+        # Plain concatenation for str values skips the format protocol
+        return "?" + "&".join([
+            key + "=" + value if type(value) is str else f"{key}={value}"
+            for key, value in params.items()
+        ])
     
-    def handle_init(self, params: Dict[str, str]) -> str:
+    def handle_init(self, params: Dict[str, str]) -> Response:
         """Handle INIT method - handshake and version check"""
-        print(f"🔄 INIT request: {params}")
+        log.debug("🔄 INIT request: %s", params)
         
         # Extract parameters
         app = params.get('app', 'Unknown')
@@ -128,139 +261,120 @@ class VSCPEmulator:
         api = params.get('api', '0.0.0')
         
         # Simulate version compatibility check
-        response_params = {}
-        
         if api == self.API_VERSION and dbversion == self.DB_VERSION:
             self.initialized = True
-            response_params = {
-                'status': '1',
-                'message': f'Initialized with {app}'
-            }
-            print(f"✓ Initialization successful for {app}")
+            self._method_fns = self._fns_ready
+            log.debug("✓ Initialization successful for %s", app)
+            return self._tmpl_init_ok(app)
         else:
             response_params = {
                 'status': '0',
                 'error': f'Version mismatch - API:{api} (need {self.API_VERSION}), DB:{dbversion} (need {self.DB_VERSION})'
             }
-            print(f"✗ Version mismatch: API {api}, DB {dbversion}")
+            log.debug("✗ Version mismatch: API %s, DB %s", api, dbversion)
         
         return self.build_message(response_params)
     
-    def handle_update(self, params: Dict[str, str]) -> str:
+    def handle_update(self, params: Dict[str, str]) -> Response:
         """Handle UPDATE method - return sensor data"""
         uid = params.get('id', '')
-        print(f"📊 UPDATE request for sensor: {uid}")
-        
-        if not self.initialized:
-            return self.build_message({'status': '0', 'error': 'Protocol not initialized'})
+        log.debug("📊 UPDATE request for sensor: %s", uid)
         
-        if uid in self.sensor_data:
-            # Get sensor data and add status
-            sensor_info = self.sensor_data[uid].copy()
-            
+        state = self.sensors.get(uid)
+        if state is not None and state.type is not None:
             # Add some random variation to make it realistic
-            for key, value in sensor_info.items():
-                if key != 'type' and isinstance(value, (int, float)):
-                    if isinstance(value, int):
-                        sensor_info[key] = value + random.randint(-2, 2)
-                    else:
-                        sensor_info[key] = round(value + random.uniform(-0.5, 0.5), 2)
-            
-            response_params = {'id': uid, 'status': '1'}
-            response_params.update(sensor_info)
+            noise = self._next_noise(len(state.numeric_keys))
+            values = _jitter(state.base, state.is_int, state.scale, noise)
             
-            print(f"✓ Sensor {uid} data: {sensor_info}")
+            # Only the jittered fields are formatted per request
+            response = state.update_prefix + "".join([
+                f"&{key}={value}" for key, value in zip(state.numeric_keys, values)
+            ])
+            log.debug("✓ Sensor %s data: %s", uid, response)
+            return response
         else:
             response_params = {
                 'id': uid,
                 'status': '0',
                 'error': f'Sensor {uid} not found'
             }
-            print(f"✗ Sensor {uid} not found")
+            log.debug("✗ Sensor %s not found", uid)
         
         return self.build_message(response_params)
     
-    def handle_config(self, params: Dict[str, str]) -> str:
+    def handle_config(self, params: Dict[str, str]) -> Response:
         """Handle CONFIG method - configure sensor"""
         uid = params.get('id', '')
-        print(f"⚙️  CONFIG request for sensor: {uid}")
-        
-        if not self.initialized:
-            return self.build_message({'status': '0', 'error': 'Protocol not initialized'})
+        log.debug("⚙️  CONFIG request for sensor: %s", uid)
         
         # Extract configuration parameters (exclude 'type' and 'id')
-        config_params = {k: v for k, v in params.items() if k not in ['type', 'id']}
+        config_params = dict(params)
+        config_params.pop('type', None)
+        config_params.pop('id', None)
         
         if uid:
             # Store configuration
-            self.sensor_configs[uid] = config_params
-            response_params = {
-                'id': uid,
-                'status': '1',
-                'message': f'Configuration applied: {config_params}'
-            }
-            print(f"✓ Sensor {uid} configured: {config_params}")
+            self._sensor_state(uid).config = config_params
+            log.debug("✓ Sensor %s configured: %s", uid, config_params)
+            return self._tmpl_config_ok(uid, config_params)
         else:
             response_params = {
                 'id': uid,
                 'status': '0',
                 'error': 'Invalid sensor ID'
             }
-            print(f"✗ Invalid sensor ID: {uid}")
+            log.debug("✗ Invalid sensor ID: %s", uid)
         
         return self.build_message(response_params)
     
-    def handle_reset(self, params: Dict[str, str]) -> str:
+    def handle_reset(self, params: Dict[str, str]) -> Response:
         """Handle RESET method - reset sensor"""
         uid = params.get('id', '')
-        print(f"🔄 RESET request for sensor: {uid}")
-        
-        if not self.initialized:
-            return self.build_message({'status': '0', 'error': 'Protocol not initialized'})
+        log.debug("🔄 RESET request for sensor: %s", uid)
         
         if uid in self.sensor_data or uid == 'all':
             # Reset sensor(s)
             if uid == 'all':
-                self.sensor_configs.clear()
-                self.connected_sensors.clear()
-                print("✓ All sensors reset")
+                # Drop ids that only existed to carry a pin or config
+                self.sensors = {
+                    sensor_id: state for sensor_id, state in self.sensors.items()
+                    if state.type is not None
+                }
+                for state in self.sensors.values():
+                    state.pin = None
+                    state.config = None
+                self._pin_to_sensor.clear()
+                log.debug("✓ All sensors reset")
             else:
-                self.sensor_configs.pop(uid, None)
-                self.connected_sensors.pop(uid, None)
-                print(f"✓ Sensor {uid} reset")
+                state = self.sensors[uid]
+                state.config = None
+                if state.pin is not None:
+                    self._pin_to_sensor.pop(state.pin, None)
+                    state.pin = None
+                log.debug("✓ Sensor %s reset", uid)
             
-            response_params = {
-                'id': uid,
-                'status': '1'
-            }
+            return self._tmpl_reset_ok(uid)
         else:
             response_params = {
                 'id': uid,
                 'status': '0',
                 'error': f'Sensor {uid} not found'
             }
-            print(f"✗ Sensor {uid} not found for reset")
+            log.debug("✗ Sensor %s not found for reset", uid)
         
         return self.build_message(response_params)
     
-    def handle_connect(self, params: Dict[str, str]) -> str:
+    def handle_connect(self, params: Dict[str, str]) -> Response:
         """Handle CONNECT method - connect sensor to pin"""
         uid = params.get('id', '')
         pin = params.get('pin', '')
-        print(f"🔌 CONNECT request: sensor {uid} to pin {pin}")
-        
-        if not self.initialized:
-            return self.build_message({'status': '0', 'error': 'Protocol not initialized'})
+        log.debug("🔌 CONNECT request: sensor %s to pin %s", uid, pin)
         
         if uid and pin:
             try:
                 pin_num = int(pin)
                 # Check if pin is already used
-                used_by = None
-                for sensor_id, used_pin in self.connected_sensors.items():
-                    if used_pin == pin_num:
-                        used_by = sensor_id
-                        break
+                used_by = self._pin_to_sensor.get(pin_num)
                 
                 if used_by and used_by != uid:
                     response_params = {
@@ -268,15 +382,16 @@ class VSCPEmulator:
                         'status': '0',
                         'error': f'Pin {pin} already used by sensor {used_by}'
                     }
-                    print(f"✗ Pin {pin} conflict: used by {used_by}")
+                    log.debug("✗ Pin %s conflict: used by %s", pin, used_by)
                 else:
-                    self.connected_sensors[uid] = pin_num
-                    response_params = {
-                        'id': uid,
-                        'status': '1',
-                        'pin': pin
-                    }
-                    print(f"✓ Sensor {uid} connected to pin {pin}")
+                    # Release the previous pin when reconnecting the same sensor
+                    state = self._sensor_state(uid)
+                    if state.pin is not None:
+                        self._pin_to_sensor.pop(state.pin, None)
+                    state.pin = pin_num
+                    self._pin_to_sensor[pin_num] = uid
+                    log.debug("✓ Sensor %s connected to pin %s", uid, pin)
+                    return self._tmpl_connect_ok(uid, pin)
                     
             except ValueError:
                 response_params = {
@@ -284,108 +399,124 @@ class VSCPEmulator:
                     'status': '0',
                     'error': f'Invalid pin number: {pin}'
                 }
-                print(f"✗ Invalid pin number: {pin}")
+                log.debug("✗ Invalid pin number: %s", pin)
         else:
             response_params = {
                 'id': uid,
                 'status': '0',
                 'error': 'Missing sensor ID or pin number'
             }
-            print(f"✗ Missing parameters: uid={uid}, pin={pin}")
+            log.debug("✗ Missing parameters: uid=%s, pin=%s", uid, pin)
         
         return self.build_message(response_params)
     
-    def handle_disconnect(self, params: Dict[str, str]) -> str:
+    def handle_disconnect(self, params: Dict[str, str]) -> Response:
         """Handle DISCONNECT method - disconnect sensor from pin"""
         uid = params.get('id', '')
-        print(f"🔌 DISCONNECT request for sensor: {uid}")
-        
-        if not self.initialized:
-            return self.build_message({'status': '0', 'error': 'Protocol not initialized'})
-        
-        if uid in self.connected_sensors:
-            pin = self.connected_sensors.pop(uid)
-            response_params = {
-                'id': uid,
-                'status': '1',
-                'pin': str(pin)
-            }
-            print(f"✓ Sensor {uid} disconnected from pin {pin}")
+        log.debug("🔌 DISCONNECT request for sensor: %s", uid)
+        
+        state = self.sensors.get(uid)
+        if state is not None and state.pin is not None:
+            pin = state.pin
+            state.pin = None
+            self._pin_to_sensor.pop(pin, None)
+            log.debug("✓ Sensor %s disconnected from pin %s", uid, pin)
+            return self._tmpl_disconnect_ok(uid, pin)
         else:
             response_params = {
                 'id': uid,
                 'status': '0',
                 'error': f'Sensor {uid} not connected'
             }
-            print(f"✗ Sensor {uid} not connected")
+            log.debug("✗ Sensor %s not connected", uid)
         
         return self.build_message(response_params)
     
-    def process_request(self, message: str) -> str:
-        """Process incoming protocol request"""
-        params = self.parse_message(message)
+    def _not_init(self, params: Dict[str, str]) -> Response:
+        """Reject requests received before a successful INIT"""
+        log.debug("✗ %s request before INIT", params.get('type', ''))
+        return self._ERR_NOT_INIT
+    
+    def _handle_unknown(self, params: Dict[str, str]) -> Response:
+        """Handle unsupported request types"""
         request_type = params.get('type', '').upper()
-        
-        # Route to appropriate handler
-        handlers = {
-            'INIT': self.handle_init,
-            'UPDATE': self.handle_update,
-            'CONFIG': self.handle_config,
-            'RESET': self.handle_reset,
-            'CONNECT': self.handle_connect,
-            'DISCONNECT': self.handle_disconnect
-        }
-        
-        if request_type in handlers:
-            return handlers[request_type](params)
-        else:
-            return self.build_message({
+        response = self._err_unknown_type.get(request_type)
+        if response is None:
+            response = (self.build_message({
                 'status': '0',
                 'error': f'Unknown request type: {request_type}'
-            })
+            }) + '\n').encode('utf-8')
+            # Bound the cache so garbage input cannot grow it without limit
+            if len(self._err_unknown_type) < 64:
+                self._err_unknown_type[request_type] = response
+        return response
+    
+    def process_request(self, message: str) -> Response:
+        """Process incoming protocol request"""
+        params = self.parse_message(message)
+        request_type = params.get('type', '')
+        
+        # Route to appropriate handler; upper() only for non-canonical casing
+        method_id = self._method_ids.get(request_type)
+        if method_id is None:
+            method_id = self._method_ids.get(request_type.upper())
+            if method_id is None:
+                return self._handle_unknown(params)
+        return self._method_fns[method_id](params)
     
     def listen_loop(self):
         """Main listening loop for incoming requests"""
-        print("🎧 Listening for protocol requests...")
-        buffer = ""
+        log.info("🎧 Listening for protocol requests...")
+        framer = Framer()
         
         while self.running:
             try:
-                if self.ser and self.ser.in_waiting > 0:
-                    data = self.ser.read(self.ser.in_waiting).decode('utf-8', errors='ignore')
-                    buffer += data
-                    
-                    # Process complete messages (ending with newline or containing '?')
-                    while '\n' in buffer or '?' in buffer:
-                        if '\n' in buffer:
-                            line, buffer = buffer.split('\n', 1)
-                        else:
-                            # If no newline but contains '?', process the whole buffer
-                            line = buffer
-                            buffer = ""
-                        
-                        line = line.strip()
-                        if line and line.startswith('?'):
-                            print(f"📨 Received: {line}")
-                            response = self.process_request(line)
-                            
-                            # Send response
-                            if response:
-                                self.ser.write((response + '\n').encode('utf-8'))
-                                print(f"📤 Sent: {response}")
+                # Sleep in the driver until the first byte arrives; the port
+                # timeout only bounds how long shutdown waits for this thread
+                data = self.ser.read(1)
+                if not data:
+                    continue
+                # Then take whatever else is already buffered in one call
+                waiting = self.ser.in_waiting
+                if waiting:
+                    data += self.ser.read(waiting)
                 
-                time.sleep(0.01)  # Small delay to prevent busy waiting
+                # Only complete frames are decoded
+                for frame in framer.feed(data):
+                    line = frame.decode('utf-8', errors='ignore').strip()
+                    if line and line.startswith('?'):
+                        log.debug("📨 Received: %s", line)
+                        response = self.process_request(line)
+                        
+                        # Queue response (bytes are already encoded and terminated)
+                        if response:
+                            if not isinstance(response, bytes):
+                                response = (response + '\n').encode('utf-8')
+                            self._tx_queue.put(response)
                 
             except Exception as e:
-                print(f"❌ Error in listen loop: {e}")
+                log.error("❌ Error in listen loop: %s", e)
                 time.sleep(0.1)
     
+    def write_loop(self):
+        """Send queued responses so request handling never waits on serial TX"""
+        while True:
+            response = self._tx_queue.get()
+            if response is None:
+                break
+            try:
+                self.ser.write(response)
+                if log.isEnabledFor(logging.DEBUG):
+                    log.debug("📤 Sent: %s", response.decode('utf-8').rstrip())
+            except Exception as e:
+                log.error("❌ Error in write loop: %s", e)
+    
     def run(self):
         """Start the emulator"""
-        print("🚀 Starting VSCP Emulator...")
-        print(f"   API Version: {self.API_VERSION}")
-        print(f"   DB Version: {self.DB_VERSION}")
-        print(f"   Available sensors: {list(self.sensor_data.keys())}")
+        log.info("🚀 Starting VSCP Emulator...")
+        log.info("   API Version: %s", self.API_VERSION)
+        log.info("   DB Version: %s", self.DB_VERSION)
+        log.info("   Available sensors: %s", list(self.sensor_data.keys()))
         
         if not self.connect_serial():
             return
@@ -396,25 +527,44 @@ class VSCPEmulator:
         listen_thread = threading.Thread(target=self.listen_loop, daemon=True)
         listen_thread.start()
         
+        # Start writer thread
+        write_thread = threading.Thread(target=self.write_loop, daemon=True)
+        write_thread.start()
+        
         try:
-            print("\n💡 Emulator ready! Send protocol requests to test.")
-            print("   Example: ?type=INIT&app=TestApp&version=1.0.0&dbversion=1.0.0&api=1.0")
-            print("   Press Ctrl+C to stop\n")
+            log.info("\n💡 Emulator ready! Send protocol requests to test.")
+            log.info("   Example: ?type=INIT&app=TestApp&version=1.0.0&dbversion=1.0.0&api=1.0")
+            log.info("   Press Ctrl+C to stop\n")
             
             # Keep main thread alive
             while True:
                 time.sleep(1)
                 
         except KeyboardInterrupt:
-            print("\n🛑 Shutting down emulator...")
+            log.info("\n🛑 Shutting down emulator...")
         
         finally:
             self.running = False
+            self._tx_queue.put(None)
+            write_thread.join(timeout=1)
             self.disconnect_serial()
 
 def main():
     """Main entry point"""
-    emulator = VSCPEmulator(port='COM5', baudrate=115200)
+    parser = argparse.ArgumentParser(description="VSCP protocol emulator")
+    parser.add_argument('--port', default='COM5', help="serial port (default: COM5)")
+    parser.add_argument('--baudrate', type=int, default=115200, help="baud rate (default: 115200)")
+    parser.add_argument('-v', '--verbose', action='store_true',
+                        help="log every request and response")
+    args = parser.parse_args()
+    
+    # Per-request logs are DEBUG, so they cost nothing unless --verbose is set
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format="%(message)s"
+    )
+    
+    emulator = VSCPEmulator(port=args.port, baudrate=args.baudrate)
     emulator.run()
 
 if __name__ == "__main__":